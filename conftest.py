@@ -0,0 +1,22 @@
+# Command-line options have to be registered in an initial conftest, i.e. one
+# that pytest loads before collection. stingray/conftest.py is not one when
+# running ``pytest --pyargs stingray``, so the options live here.
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption("--run-legacy", action="store_true", default=False,
+                     help="also run the legacy=True cases of the tests "
+                          "parametrized over ``legacy``")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-legacy"):
+        return
+
+    skip_legacy = pytest.mark.skip(reason="legacy code path; use --run-legacy")
+    for item in items:
+        callspec = getattr(item, "callspec", None)
+        if callspec is not None and callspec.params.get("legacy") is True:
+            item.add_marker(skip_legacy)
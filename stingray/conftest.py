@@ -3,8 +3,10 @@
 # get picked up when running the tests inside an interpreter using
 # packagename.test
 
+import base64
 import os
 
+import pytest
 from astropy.tests.helper import enable_deprecations_as_exceptions  # noqa
 from astropy.version import version as astropy_version
 
@@ -35,6 +37,33 @@ def pytest_configure(config):
         TESTED_VERSIONS[packagename] = __version__
 
 
+@pytest.fixture(scope="session", autouse=True)
+def _fftw_wisdom(request):
+    """Reuse the FFTW wisdom accumulated in previous test sessions.
+
+    The wisdom is kept in the pytest cache; nothing is done if pyfftw is not
+    installed or the cache provider is disabled.
+    """
+    cache = getattr(request.config, "cache", None)
+    try:
+        import pyfftw
+    except ImportError:
+        pyfftw = None
+
+    if pyfftw is None or cache is None:
+        yield
+        return
+
+    wisdom = cache.get("stingray/fftw_wisdom", None)
+    if wisdom is not None:
+        pyfftw.import_wisdom(tuple(base64.b64decode(w) for w in wisdom))
+
+    yield
+
+    cache.set("stingray/fftw_wisdom",
+              [base64.b64encode(w).decode("ascii") for w in pyfftw.export_wisdom()])
+
+
 enable_deprecations_as_exceptions()
 # Uncomment the last two lines in this block to treat all DeprecationWarnings as
 # exceptions. For Astropy v2.0 or later, there are 2 additional keywords,
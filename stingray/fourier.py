@@ -7,7 +7,7 @@ from astropy.table import Table
 
 from .gti import (generate_indices_of_segment_boundaries_binned,
                   generate_indices_of_segment_boundaries_unbinned)
-from .utils import histogram, show_progress, sum_if_not_none_or_initialize, fft, fftfreq
+from .utils import histogram, show_progress, sum_if_not_none_or_initialize, fft, fftfreq, rfft
 
 
 def positive_fft_bins(n_bin, include_zero=False):
@@ -248,10 +248,10 @@ def normalize_frac(unnorm_power, dt, n_bin, mean_flux, background_flux=0):
     #     norm = 2 / (n_ph * meanrate) = 2 * dt / (mean**2 * n_bin)
 
     if background_flux > 0:
-        power = unnorm_power * 2. * dt / ((mean_flux - background_flux) ** 2 * n_bin)
+        power = unnorm_power * (2. * dt / ((mean_flux - background_flux) ** 2 * n_bin))
     else:
         # Note: this corresponds to eq. 3 in Uttley+14
-        power = unnorm_power * 2. * dt / (mean_flux ** 2 * n_bin)
+        power = unnorm_power * (2. * dt / (mean_flux ** 2 * n_bin))
     return power
 
 
@@ -303,7 +303,7 @@ def normalize_abs(unnorm_power, dt, n_bin):
     #     meanrate = mean / dt
     #     norm = 2 / (n_ph * meanrate) * meanrate**2 = 2 * dt / (mean**2 * n_bin) * mean**2 / dt**2
 
-    return unnorm_power * 2. / n_bin / dt
+    return unnorm_power * (2. / n_bin / dt)
 
 
 def normalize_leahy_from_variance(unnorm_power, variance, n_bin):
@@ -356,7 +356,7 @@ def normalize_leahy_from_variance(unnorm_power, variance, n_bin):
     if variance == 0.:
         raise ValueError(
             "The variance used to normalize the periodogram is 0.")
-    return unnorm_power * 2. / (variance * n_bin)
+    return unnorm_power * (2. / (variance * n_bin))
 
 
 def normalize_leahy_poisson(unnorm_power, n_ph):
@@ -397,7 +397,7 @@ def normalize_leahy_poisson(unnorm_power, n_ph):
     >>> np.isclose(pdsnorm[1:n_bin//2].mean(), poisson_level(norm="leahy"), rtol=0.01)
     True
     """
-    return unnorm_power * 2. / n_ph
+    return unnorm_power * (2. / n_ph)
 
 
 def normalize_periodograms(unnorm_power, dt, n_bin, mean_flux=None, n_ph=None, variance=None, background_flux=0., norm="frac", power_type="all"):
@@ -950,14 +950,14 @@ def avg_pds_from_iterable(flux_iterable, dt, norm="frac", use_common_mean=True,
             flux, err = flux
             variance = np.mean(err) ** 2
 
-        # Calculate the FFT
+        # Calculate the FFT. Light curves are real: only compute the
+        # non-negative frequencies, as the negative ones are not used anyway
         n_bin = flux.size
-        ft = fft(flux)
+        ft = rfft(flux) if np.isrealobj(flux) else fft(flux)
 
         # This will only be used by the Leahy normalization, so only if
         # the input light curve is in units of counts/bin
         n_ph = flux.sum()
-        unnorm_power = (ft * ft.conj()).real
 
         # Accumulate the sum of means and variances, to get the final mean and
         # variance the end
@@ -973,7 +973,8 @@ def avg_pds_from_iterable(flux_iterable, dt, norm="frac", use_common_mean=True,
             freq = fftfreq(n_bin, dt)[fgt0]
 
         # No need for the negative frequencies
-        unnorm_power = unnorm_power[fgt0]
+        ft = ft[fgt0]
+        unnorm_power = ft.real ** 2 + ft.imag ** 2
 
         # If the user wants to normalize using the mean of the total lightcurve,
         # normalize it here
@@ -1658,9 +1658,22 @@ class Lightcurve(StingrayTimeseries):
         Split the current :class:`Lightcurve` object into a list of :class:`Lightcurve` objects, one
         for each continuous GTI segment as defined in the ``gti`` attribute.
 
+        The new light curves are views: their ``time``, ``counts`` and
+        ``counts_err`` arrays share memory with those of the original light
+        curve: splitting copies no data and leaves the original light curve
+        unchanged.
+        Writing into these arrays (e.g. ``lc_seg.counts[0] = 0``) also
+        modifies the original light curve, while operations that build new
+        arrays (e.g. rebinning) return light curves that no longer share
+        memory with it. To modify a segment in place, copy it first, e.g.
+        with ``copy.deepcopy(lc_seg)`` or ``lc_seg.counts = lc_seg.counts.copy()``.
+
         Parameters
         ----------
-        min_points : int, default 1
+        gti : ``[[gti00, gti01], [gti10, gti11], ...]``, default None
+            The GTIs to split on. If None, the ``gti`` attribute is used.
+
+        min_points : int, default 2
             The minimum number of data points in each light curve. Light
             curves with fewer data points will be ignored.
 
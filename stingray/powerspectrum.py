@@ -1055,14 +1055,13 @@ class DynamicalPowerspectrum(AveragedPowerspectrum):
         if max_freq is None:
             max_freq = np.max(self.freq)
 
-        max_positions = []
-        for ps in self.dyn_ps.T:
-            indices = np.logical_and(self.freq <= max_freq,
-                                     min_freq <= self.freq)
-            max_power = np.max(ps[indices])
-            max_positions.append(np.where(ps == max_power)[0][0])
-
-        return np.array(max_positions)
+        indices = np.flatnonzero(np.logical_and(self.freq <= max_freq,
+                                                min_freq <= self.freq))
+        # Position of the maximum of each segment (column), within the
+        # allowed frequency range
+        max_positions = indices[np.argmax(self.dyn_ps[indices], axis=0)]
+
+        return max_positions
 
     def rebin_time(self, dt_new, method='sum'):
         """
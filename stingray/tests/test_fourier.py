@@ -1,13 +1,99 @@
 import os
-from pickle import FALSE
+import zlib
+import functools
+from types import SimpleNamespace
+
+import numpy as np
 import pytest
-from stingray.fourier import *
+import scipy.fft
+from scipy.fft import rfft, rfftfreq
+
+from stingray.fourier import (
+    avg_cs_from_events, avg_pds_from_events, bias_term,
+    error_on_averaged_cross_spectrum, estimate_intrinsic_coherence,
+    get_average_ctrate, get_flux_iterable_from_segments, normalize_abs,
+    normalize_frac, normalize_leahy_from_variance, normalize_periodograms,
+    poisson_level, positive_fft_bins, raw_coherence)
 
 curdir = os.path.abspath(os.path.dirname(__file__))
 datadir = os.path.join(curdir, "data")
 
+SEED = 12345
+
+
+def _rng(tag):
+    """Random generator seeded from SEED and a tag, independent of test order."""
+    return np.random.default_rng([SEED, zlib.crc32(tag.encode())])
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _fft_backend():
+    """Run the ``scipy.fft`` calls of this module through MKL or FFTW.
+
+    The backend is only set while the tests in this module run, so that the
+    rest of the test suite (e.g. ``scipy.signal.fftconvolve``) keeps using the
+    default scipy backend. The data fixtures that compute FFTs request it
+    explicitly, so that it is set up before them.
+    """
+    try:
+        import mkl_fft._scipy_fft_backend as backend
+    except ImportError:
+        try:
+            from pyfftw.interfaces import scipy_fft as backend
+        except ImportError:
+            backend = None
+
+    if backend is None:
+        yield
+        return
+
+    with scipy.fft.set_backend(backend):
+        yield
+
+
+def _mag2(x):
+    """Squared modulus of a complex array, without the temporary of ``np.abs``."""
+    return x.real * x.real + x.imag * x.imag
+
+
+@functools.lru_cache(maxsize=None)
+def _poisson_buf():
+    """Poisson light curve (mean 1e5, 1e6 bins) shared by the normalization tests.
+
+    Seeded with 42, so that the tests are reproducible. The buffer is
+    cast to float once and is read-only, so that callers can use slices
+    of it directly.
+    """
+    rng = np.random.default_rng(42)
+    buf = rng.poisson(100000, 10**6).astype(np.float64)
+    buf.flags.writeable = False
+    return buf
+
+
+def _sorted_uniform(rng, length, n):
+    """``n`` sorted uniform times in [0, length), without sorting.
+
+    The normalized cumulative sum of ``n + 1`` exponential deviates is
+    distributed as the order statistics of ``n`` uniform deviates.
+    """
+    t = np.cumsum(rng.exponential(size=n + 1))
+    return t[:-1] * (length / t[-1])
+
+
+def _uniform_hist(times, length, n_bin):
+    """Histogram of times in ``n_bin`` equal bins between 0 and ``length``."""
+    idx = (times * (n_bin / length)).astype(np.intp)
+    idx.clip(0, n_bin - 1, out=idx)
+    return np.bincount(idx, minlength=n_bin)
+
 
 def compare_tables(table1, table2, rtol=0.001, discard=[]):
+    """Compare metadata and columns of two tables.
+
+    Integer and string metadata must be identical; all the other numbers
+    are checked at once, with a single call to ``assert_allclose``.
+    """
+    values1, values2 = [], []
     for key in table1.meta.keys():
         if key in discard:
             continue
@@ -17,16 +103,17 @@ def compare_tables(table1, table2, rtol=0.001, discard=[]):
             assert oe == oc
         elif oe is None:
             assert oc is None
-        elif isinstance(oe, Iterable):
-            assert np.allclose(oe, oc, rtol=rtol)
         else:
-            assert np.isclose(oe, oc, rtol=rtol)
+            values1.append(np.ravel(oe))
+            values2.append(np.ravel(oc))
     for col in table1.colnames:
         if col in discard:
             continue
-        oe, oc = table1[col], table2[col]
-        assert np.allclose(oe, oc, rtol=rtol)
+        values1.append(np.ravel(table1[col]))
+        values2.append(np.ravel(table2[col]))
 
+    np.testing.assert_allclose(
+        np.concatenate(values1), np.concatenate(values2), rtol=rtol, atol=1e-8)
 
 
 def test_norm():
@@ -34,9 +121,8 @@ def test_norm():
     N = 1000000
     dt = 0.2
     meanrate = mean / dt
-    lc = np.random.poisson(mean, N)
-    pds = np.abs(fft(lc)) ** 2
-    freq = fftfreq(N, dt)
+    lc = _poisson_buf()[:N]
+    pds = _mag2(rfft(lc, workers=-1))
     good = slice(1, N // 2)
 
     pdsabs = normalize_abs(pds, dt, lc.size)
@@ -48,54 +134,197 @@ def test_norm():
     assert np.isclose(pdsfrac[good].mean(), pois_frac, rtol=0.01)
 
 
+@pytest.fixture(scope="module")
+def _coherence_fixture(_fft_backend):
+    rng = np.random.default_rng(0)
+    # 10000 = 2**4 * 5**4 bins, already a fast FFT length
+    data = np.load(os.path.join(datadir, "sample_variable_lc.npy"))[:10000] * 1000
+    data1 = rng.poisson(data)
+    data2 = rng.poisson(data)
+    ft1, ft2 = rfft(np.stack([data1, data2]).astype(np.float64), axis=1, workers=-1)
+    dt = 0.01
+    N = data.size
+    mean = np.mean(data)
+    meanrate = mean / dt
+    freq = rfftfreq(data.size, dt)
+    good = (freq > 0) & (freq < 0.1)
+    ft1, ft2 = ft1[good], ft2[good]
+    return SimpleNamespace(
+        data1=data1,
+        data2=data2,
+        N=N,
+        cross=normalize_periodograms(
+            ft1 * ft2.conj(), dt, N, mean, norm="abs", power_type="all"),
+        pds1=normalize_periodograms(
+            _mag2(ft1), dt, N, mean, norm="abs", power_type="real"),
+        pds2=normalize_periodograms(
+            _mag2(ft2), dt, N, mean, norm="abs", power_type="real"),
+        p1noise=poisson_level(meanrate=meanrate, norm="abs"),
+        p2noise=poisson_level(meanrate=meanrate, norm="abs"),
+    )
+
+
+@pytest.fixture(scope="module", params=[1000, pytest.param(10000, marks=pytest.mark.slow)])
+def _fourier_fixture(request):
+    rng = np.random.default_rng(0)
+    dt = 1
+    length = 100
+    ctrate = request.param
+    N = np.rint(length / dt).astype(int)
+    dt = length / N
+    times = _sorted_uniform(rng, length, int(length * ctrate))
+    counts = _uniform_hist(times, length, N)
+    times2 = _sorted_uniform(rng, length, int(length * ctrate))
+    counts2 = _uniform_hist(times2, length, N)
+    return SimpleNamespace(
+        dt=dt,
+        length=length,
+        ctrate=ctrate,
+        N=N,
+        times=times,
+        gti=np.asarray([[0, length]]),
+        counts=counts,
+        errs=np.ones_like(counts) * np.sqrt(ctrate),
+        bin_times=(np.arange(N) + 0.5) * dt,
+        segment_size=5.0,
+        times2=times2,
+        counts2=counts2,
+        errs2=np.ones_like(counts2) * np.sqrt(ctrate),
+    )
+
+
+@pytest.fixture(scope="module")
+def _norms_fixture(_fft_backend):
+    mean = var = 100000.
+    # 2**8 * 5**5, already a fast FFT length: no need to zero-pad
+    N = 800000
+    dt = 0.2
+    good = positive_fft_bins(N)
+    lc = _poisson_buf()[:N]
+    pds = _mag2(rfft(lc, workers=-1))[good]
+
+    # Only keep the periodograms (and the variance needed by the tests)
+    # of the modified light curves, not the light curves themselves
+    lc_mod = lc - mean
+    var_bksub = np.var(lc_mod)
+    pds_bksub = _mag2(rfft(lc_mod, workers=-1))[good]
+    lc_mod = lc / mean
+    pds_renorm = _mag2(rfft(lc_mod, workers=-1))[good]
+    lc_mod -= 1
+    pds_renorm_bksub = _mag2(rfft(lc_mod, workers=-1))[good]
+    del lc_mod
+
+    return SimpleNamespace(
+        mean=mean,
+        var=var,
+        N=N,
+        dt=dt,
+        df=1 / (N * dt),
+        good=good,
+        meanrate=mean / dt,
+        lc=lc,
+        nph=np.sum(lc),
+        pds=pds,
+        var_bksub=var_bksub,
+        pds_bksub=pds_bksub,
+        pds_renorm=pds_renorm,
+        pds_renorm_bksub=pds_renorm_bksub,
+    )
+
+
+@pytest.fixture(scope="module")
+def norm_mean_cached(_norms_fixture):
+    """Mean normalized power of ``_norms_fixture``, once per (norm, power_type).
+
+    All normalizations are a constant rescaling of the (here real and
+    positive) periodogram, so we normalize its mean instead of averaging
+    the normalized periodogram, and never build the normalized array.
+    """
+    data = _norms_fixture
+    pds_mean = data.pds.mean()
+
+    @functools.lru_cache(maxsize=None)
+    def _norm_mean_cached(norm, power_type="all"):
+        return normalize_periodograms(
+            pds_mean, data.dt, data.N, data.mean, n_ph=data.nph,
+            norm=norm, power_type=power_type)
+
+    return _norm_mean_cached
+
+
+@pytest.fixture(scope="class")
+def cached_pds_out_ev(_fourier_fixture):
+    data = _fourier_fixture
+    cache = {}
+
+    def _get(norm, use_common_mean):
+        key = (norm, use_common_mean)
+        if key not in cache:
+            cache[key] = avg_pds_from_events(
+                data.times,
+                data.gti,
+                data.segment_size,
+                data.dt,
+                norm=norm,
+                use_common_mean=use_common_mean,
+                silent=True,
+                fluxes=None,
+            )
+        return cache[key]
+
+    return _get
+
+
+@pytest.fixture(scope="class")
+def cached_cs_out_ev(_fourier_fixture):
+    data = _fourier_fixture
+    cache = {}
+
+    def _get(norm, use_common_mean):
+        key = (norm, use_common_mean)
+        if key not in cache:
+            cache[key] = avg_cs_from_events(
+                data.times,
+                data.times2,
+                data.gti,
+                data.segment_size,
+                data.dt,
+                norm=norm,
+                use_common_mean=use_common_mean,
+                silent=False,
+            )
+        return cache[key]
+
+    return _get
+
+
 class TestCoherence(object):
-    @classmethod
-    def setup_class(cls):
-        data = np.load(os.path.join(datadir, "sample_variable_lc.npy"))[:10000] * 1000
-        cls.data1 = np.random.poisson(data)
-        cls.data2 = np.random.poisson(data)
-        ft1 = np.fft.fft(cls.data1)
-        ft2 = np.fft.fft(cls.data2)
-        dt = 0.01
-        cls.N = data.size
-        mean = np.mean(data)
-        meanrate = mean / dt
-        freq = np.fft.fftfreq(data.size, dt)
-        good = (freq > 0) & (freq < 0.1)
-        ft1, ft2 = ft1[good], ft2[good]
-        cls.cross = normalize_periodograms(
-            ft1 * ft2.conj(), dt, cls.N, mean, norm="abs", power_type="all")
-        cls.pds1 = normalize_periodograms(
-            ft1 * ft1.conj(), dt, cls.N, mean, norm="abs", power_type="real")
-        cls.pds2 = normalize_periodograms(
-            ft2 * ft2.conj(), dt, cls.N, mean, norm="abs", power_type="real")
-
-        cls.p1noise = poisson_level(meanrate=meanrate, norm="abs")
-        cls.p2noise = poisson_level(meanrate=meanrate, norm="abs")
-
-    def test_intrinsic_coherence(self):
+    def test_intrinsic_coherence(self, _coherence_fixture):
+        data = _coherence_fixture
         coh = estimate_intrinsic_coherence(
-            self.cross, self.pds1, self.pds2, self.p1noise, self.p2noise, self.N)
+            data.cross, data.pds1, data.pds2, data.p1noise, data.p2noise, data.N)
         assert np.allclose(coh, 1, atol=0.001)
 
-    def test_raw_high_coherence(self):
-        coh = raw_coherence(self.cross, self.pds1, self.pds2, self.p1noise, self.p2noise, self.N)
+    def test_raw_high_coherence(self, _coherence_fixture):
+        data = _coherence_fixture
+        coh = raw_coherence(data.cross, data.pds1, data.pds2, data.p1noise, data.p2noise, data.N)
         assert np.allclose(coh, 1, atol=0.001)
 
-    def test_raw_low_coherence(self):
+    def test_raw_low_coherence(self, _coherence_fixture):
+        data = _coherence_fixture
         nbins = 2
-        C, P1, P2 = self.cross[:nbins], self.pds1[:nbins], self.pds2[:nbins]
-        bsq = bias_term(P1, P2, self.p1noise, self.p2noise, self.N)
+        C, P1, P2 = data.cross[:nbins], data.pds1[:nbins], data.pds2[:nbins]
+        bsq = bias_term(P1, P2, data.p1noise, data.p2noise, data.N)
         # must be lower than bsq!
-        low_coh_cross = np.random.normal(bsq**0.5 / 10, bsq**0.5 / 100) + 0.j
-        coh = raw_coherence(low_coh_cross, P1, P2, self.p1noise, self.p2noise, self.N)
+        low_coh_cross = _rng('raw_low_coherence').normal(bsq**0.5 / 10, bsq**0.5 / 100) + 0.j
+        coh = raw_coherence(low_coh_cross, P1, P2, data.p1noise, data.p2noise, data.N)
         assert np.allclose(coh, 0)
         # Do it with a single number
         coh = raw_coherence(low_coh_cross[0], P1[0],
-                            P2[0], self.p1noise, self.p2noise, self.N)
+                            P2[0], data.p1noise, data.p2noise, data.N)
         # Do it with a single complex object
         coh = raw_coherence(complex(low_coh_cross[0]), P1[0],
-                            P2[0], self.p1noise, self.p2noise, self.N)
+                            P2[0], data.p1noise, data.p2noise, data.N)
 
     def test_raw_high_bias(self):
         """Test when squared bias higher than squared norm of cross spec"""
@@ -113,35 +342,20 @@ class TestCoherence(object):
 
 
 class TestFourier(object):
-    @classmethod
-    def setup_class(cls):
-        cls.dt = 1
-        cls.length = 100
-        cls.ctrate = 10000
-        cls.N = np.rint(cls.length / cls.dt).astype(int)
-        cls.dt = cls.length / cls.N
-        cls.times = np.sort(np.random.uniform(0, cls.length, int(cls.length * cls.ctrate)))
-        cls.gti = np.asarray([[0, cls.length]])
-        cls.counts, bins = np.histogram(cls.times, bins=np.linspace(0, cls.length, cls.N + 1))
-        cls.errs = np.ones_like(cls.counts) * np.sqrt(cls.ctrate)
-        cls.bin_times = (bins[:-1] + bins[1:]) / 2
-        cls.segment_size = 5.0
-        cls.times2 = np.sort(np.random.uniform(0, cls.length, int(cls.length * cls.ctrate)))
-        cls.counts2, _ = np.histogram(cls.times2, bins=np.linspace(0, cls.length, cls.N + 1))
-        cls.errs2 = np.ones_like(cls.counts2) * np.sqrt(cls.ctrate)
-
     def test_error_on_averaged_cross_spectrum_low_nave(self):
         with pytest.warns(UserWarning) as record:
             error_on_averaged_cross_spectrum(4 + 1.j, 2, 4, 29, 2, 2)
         assert np.any(["n_ave is below 30."
                        in r.message.args[0] for r in record])
 
-    def test_ctrate_events(self):
-        assert get_average_ctrate(self.times, self.gti, self.segment_size) == self.ctrate
+    def test_ctrate_events(self, _fourier_fixture):
+        data = _fourier_fixture
+        assert get_average_ctrate(data.times, data.gti, data.segment_size) == data.ctrate
 
-    def test_ctrate_counts(self):
-        assert get_average_ctrate(self.bin_times, self.gti, self.segment_size,
-                                self.counts) == self.ctrate
+    def test_ctrate_counts(self, _fourier_fixture):
+        data = _fourier_fixture
+        assert get_average_ctrate(data.bin_times, data.gti, data.segment_size,
+                                data.counts) == data.ctrate
 
     def test_fts_from_segments_invalid(self):
         with pytest.raises(ValueError) as excinfo:
@@ -150,50 +364,56 @@ class TestFourier(object):
                 pass
         assert 'At least one between fluxes' in str(excinfo.value)
 
-    def test_fts_from_segments_cts_and_events_are_equal(self):
-        N = np.rint(self.segment_size / self.dt).astype(int)
+    def test_fts_from_segments_cts_and_events_are_equal(self, _fourier_fixture):
+        data = _fourier_fixture
+        N = np.rint(data.segment_size / data.dt).astype(int)
         fts_evts = [
-            f for f in get_flux_iterable_from_segments(self.times, self.gti, self.segment_size, n_bin=N)
+            f for f in get_flux_iterable_from_segments(
+                data.times, data.gti, data.segment_size, n_bin=N)
         ]
         fts_cts = [
             f
             for f in get_flux_iterable_from_segments(
-                self.bin_times, self.gti, self.segment_size, fluxes=self.counts
+                data.bin_times, data.gti, data.segment_size, fluxes=data.counts
             )
         ]
         for fe, fc in zip(fts_evts, fts_cts):
             assert np.allclose(fe, fc)
 
-    def test_avg_pds_bad_input(self):
-        times = np.sort(np.random.uniform(0, 1000, 1))
-        out_ev = avg_pds_from_events(times, self.gti, self.segment_size, self.dt)
+    def test_avg_pds_bad_input(self, _fourier_fixture):
+        data = _fourier_fixture
+        times = np.sort(_rng('avg_pds_bad_input').uniform(0, 1000, 1))
+        out_ev = avg_pds_from_events(times, data.gti, data.segment_size, data.dt)
         assert out_ev is None
 
     @pytest.mark.parametrize("return_auxil", [True, False])
-    def test_avg_cs_bad_input(self, return_auxil):
-        times1 = np.sort(np.random.uniform(0, 1000, 1))
-        times2 = np.sort(np.random.uniform(0, 1000, 1))
-        out_ev = avg_cs_from_events(times1, times2, self.gti,
-                                    self.segment_size, self.dt, return_auxil=return_auxil)
+    def test_avg_cs_bad_input(self, return_auxil, _fourier_fixture):
+        data = _fourier_fixture
+        rng = _rng('avg_cs_bad_input')
+        times1 = np.sort(rng.uniform(0, 1000, 1))
+        times2 = np.sort(rng.uniform(0, 1000, 1))
+        out_ev = avg_cs_from_events(times1, times2, data.gti,
+                                    data.segment_size, data.dt, return_auxil=return_auxil)
         assert out_ev is None
 
     @pytest.mark.parametrize("norm", ["frac", "abs", "none", "leahy"])
-    def test_avg_pds_use_common_mean_similar_stats(self, norm):
+    def test_avg_pds_use_common_mean_similar_stats(self, norm, _fourier_fixture):
+        data = _fourier_fixture
         out_comm = avg_pds_from_events(
-            self.times,
-            self.gti,
-            self.segment_size,
-            self.dt,
+            data.times,
+            data.gti,
+            data.segment_size,
+            data.dt,
             norm=norm,
             use_common_mean=True,
             silent=True,
             fluxes=None,
         )["power"]
         out = avg_pds_from_events(
-            self.times,
-            self.gti,
-            self.segment_size,
-            self.dt,
+            data.times,
+            data.gti,
+            data.segment_size,
+            data.dt,
             norm=norm,
             use_common_mean=False,
             silent=True,
@@ -202,142 +422,88 @@ class TestFourier(object):
         assert np.isclose(out_comm.std(), out.std(), rtol=0.1)
 
     @pytest.mark.parametrize("norm", ["frac", "abs", "none", "leahy"])
-    def test_avg_cs_use_common_mean_similar_stats(self, norm):
+    def test_avg_cs_use_common_mean_similar_stats(self, norm, _fourier_fixture):
+        data = _fourier_fixture
         out_comm = avg_cs_from_events(
-            self.times,
-            self.times2,
-            self.gti,
-            self.segment_size,
-            self.dt,
+            data.times,
+            data.times2,
+            data.gti,
+            data.segment_size,
+            data.dt,
             norm=norm,
             use_common_mean=True,
             silent=True,
         )["power"]
         out = avg_cs_from_events(
-            self.times,
-            self.times2,
-            self.gti,
-            self.segment_size,
-            self.dt,
+            data.times,
+            data.times2,
+            data.gti,
+            data.segment_size,
+            data.dt,
             norm=norm,
             use_common_mean=False,
             silent=True,
         )["power"]
         assert np.isclose(out_comm.std(), out.std(), rtol=0.1)
 
+    @pytest.mark.parametrize("errors_attr", [None, "errs"])
     @pytest.mark.parametrize("use_common_mean", [True, False])
     @pytest.mark.parametrize("norm", ["frac", "abs", "none", "leahy"])
-    def test_avg_pds_cts_and_events_are_equal(self, norm, use_common_mean):
-        out_ev = avg_pds_from_events(
-            self.times,
-            self.gti,
-            self.segment_size,
-            self.dt,
-            norm=norm,
-            use_common_mean=use_common_mean,
-            silent=True,
-            fluxes=None,
-        )
+    def test_avg_pds_cts_and_events_are_equal(
+            self, norm, use_common_mean, errors_attr, cached_pds_out_ev, _fourier_fixture):
+        data = _fourier_fixture
+        errors = None if errors_attr is None else getattr(data, errors_attr)
+        out_ev = cached_pds_out_ev(norm, use_common_mean)
         out_ct = avg_pds_from_events(
-            self.bin_times,
-            self.gti,
-            self.segment_size,
-            self.dt,
+            data.bin_times,
+            data.gti,
+            data.segment_size,
+            data.dt,
             norm=norm,
             use_common_mean=use_common_mean,
             silent=True,
-            fluxes=self.counts,
+            fluxes=data.counts,
+            errors=errors,
         )
-        compare_tables(out_ev, out_ct)
+        if errors is None:
+            compare_tables(out_ev, out_ct)
+            return
 
-    @pytest.mark.parametrize("use_common_mean", [True, False])
-    @pytest.mark.parametrize("norm", ["frac", "abs", "none", "leahy"])
-    def test_avg_pds_cts_and_err_and_events_are_equal(self, norm, use_common_mean):
-        out_ev = avg_pds_from_events(
-            self.times,
-            self.gti,
-            self.segment_size,
-            self.dt,
-            norm=norm,
-            use_common_mean=use_common_mean,
-            silent=True,
-            fluxes=None,
-        )
-        out_ct = avg_pds_from_events(
-            self.bin_times,
-            self.gti,
-            self.segment_size,
-            self.dt,
-            norm=norm,
-            use_common_mean=use_common_mean,
-            silent=True,
-            fluxes=self.counts,
-            errors=self.errs,
-        )
         # The variance is not _supposed_ to be equal, when we specify errors
         if use_common_mean:
             compare_tables(out_ev, out_ct, rtol=0.01, discard=["variance"])
         else:
             compare_tables(out_ev, out_ct, rtol=0.1, discard=["variance"])
 
+    @pytest.mark.parametrize("errors_attr", [None, "errs"])
     @pytest.mark.parametrize("use_common_mean", [True, False])
     @pytest.mark.parametrize("norm", ["frac", "abs", "none", "leahy"])
-    def test_avg_cs_cts_and_events_are_equal(self, norm, use_common_mean):
-        out_ev = avg_cs_from_events(
-            self.times,
-            self.times2,
-            self.gti,
-            self.segment_size,
-            self.dt,
-            norm=norm,
-            use_common_mean=use_common_mean,
-            silent=False,
-        )
-        out_ct = avg_cs_from_events(
-            self.bin_times,
-            self.bin_times,
-            self.gti,
-            self.segment_size,
-            self.dt,
-            norm=norm,
-            use_common_mean=use_common_mean,
-            silent=False,
-            fluxes1=self.counts,
-            fluxes2=self.counts2,
-        )
-        if use_common_mean:
-            compare_tables(out_ev, out_ct, rtol=0.01)
-        else:
-            compare_tables(out_ev, out_ct, rtol=0.1)
-
-    @pytest.mark.parametrize("use_common_mean", [True, False])
-    @pytest.mark.parametrize("norm", ["frac", "abs", "none", "leahy"])
-    def test_avg_cs_cts_and_err_and_events_are_equal(self, norm, use_common_mean):
-        out_ev = avg_cs_from_events(
-            self.times,
-            self.times2,
-            self.gti,
-            self.segment_size,
-            self.dt,
-            norm=norm,
-            use_common_mean=use_common_mean,
-            silent=False,
-        )
+    def test_avg_cs_cts_and_events_are_equal(
+            self, norm, use_common_mean, errors_attr, cached_cs_out_ev, _fourier_fixture):
+        data = _fourier_fixture
+        errors1 = errors2 = None
+        if errors_attr is not None:
+            errors1 = getattr(data, errors_attr)
+            errors2 = getattr(data, errors_attr + "2")
+        out_ev = cached_cs_out_ev(norm, use_common_mean)
         out_ct = avg_cs_from_events(
-            self.bin_times,
-            self.bin_times,
-            self.gti,
-            self.segment_size,
-            self.dt,
+            data.bin_times,
+            data.bin_times,
+            data.gti,
+            data.segment_size,
+            data.dt,
             norm=norm,
             use_common_mean=use_common_mean,
             silent=False,
-            fluxes1=self.counts,
-            fluxes2=self.counts2,
-            errors1=self.errs,
-            errors2=self.errs2,
+            fluxes1=data.counts,
+            fluxes2=data.counts2,
+            errors1=errors1,
+            errors2=errors2,
         )
-        discard = [m for m in out_ev.meta.keys() if "variance" in m]
+        discard = []
+        if errors_attr is not None:
+            # The variance is not _supposed_ to be equal, when we specify errors
+            discard = [m for m in out_ev.meta.keys() if "variance" in m]
         if use_common_mean:
             compare_tables(out_ev, out_ct, rtol=0.01, discard=discard)
         else:
@@ -345,116 +511,100 @@ class TestFourier(object):
 
 
 class TestNorms(object):
-    @classmethod
-    def setup_class(cls):
-        cls.mean = cls.var = 100000.
-        cls.N = 800000
-        cls.dt = 0.2
-        cls.df = 1 / (cls.N * cls.dt)
-        freq = fftfreq(cls.N, cls.dt)
-        good = freq > 0
-        cls.good = good
-        cls.meanrate = cls.mean / cls.dt
-        cls.lc = np.random.poisson(cls.mean, cls.N).astype(float)
-        cls.nph = np.sum(cls.lc)
-        cls.pds = (np.abs(np.fft.fft(cls.lc)) ** 2)[good]
-        cls.lc_bksub = cls.lc - cls.mean
-        cls.pds_bksub = (np.abs(np.fft.fft(cls.lc_bksub)) ** 2)[good]
-        cls.lc_renorm = cls.lc / cls.mean
-        cls.pds_renorm = (np.abs(np.fft.fft(cls.lc_renorm)) ** 2)[good]
-        cls.lc_renorm_bksub = cls.lc_renorm - 1
-        cls.pds_renorm_bksub = (np.abs(np.fft.fft(cls.lc_renorm_bksub)) ** 2)[good]
-
-    def test_leahy_bksub_var_vs_standard(self):
+    def test_leahy_bksub_var_vs_standard(self, _norms_fixture):
         """Test that the Leahy norm. does not change with background-subtracted lcs"""
-        leahyvar = normalize_leahy_from_variance(self.pds_bksub, np.var(self.lc_bksub), self.N)
-        leahy = 2 * self.pds / np.sum(self.lc)
+        data = _norms_fixture
+        leahyvar = normalize_leahy_from_variance(data.pds_bksub, data.var_bksub, data.N)
+        leahy = 2 * data.pds / data.nph
         ratio = np.mean(leahyvar / leahy)
         assert np.isclose(ratio, 1, rtol=0.01)
 
-    def test_abs_bksub(self):
+    def test_abs_bksub(self, _norms_fixture):
         """Test that the abs rms normalization does not change with background-subtracted lcs"""
-        ratio = normalize_abs(self.pds_bksub, self.dt, self.N) / normalize_abs(
-            self.pds, self.dt, self.N
+        data = _norms_fixture
+        ratio = normalize_abs(data.pds_bksub, data.dt, data.N) / normalize_abs(
+            data.pds, data.dt, data.N
         )
         assert np.isclose(ratio.mean(), 1, rtol=0.01)
 
-    def test_frac_renorm_constant(self):
+    def test_frac_renorm_constant(self, _norms_fixture):
         """Test that the fractional rms normalization is equivalent when renormalized"""
-        ratio = normalize_frac(self.pds_renorm, self.dt, self.N, 1) / normalize_frac(
-            self.pds, self.dt, self.N, self.mean
+        data = _norms_fixture
+        ratio = normalize_frac(data.pds_renorm, data.dt, data.N, 1) / normalize_frac(
+            data.pds, data.dt, data.N, data.mean
         )
         assert np.isclose(ratio.mean(), 1, rtol=0.01)
 
-    def test_frac_to_abs_ctratesq(self):
+    def test_frac_to_abs_ctratesq(self, _norms_fixture):
         """Test that fractional rms normalization x ctrate**2 is equivalent to abs renormalized"""
+        data = _norms_fixture
         ratio = (
-            normalize_frac(self.pds, self.dt, self.N, self.mean)
-            / normalize_abs(self.pds, self.dt, self.N)
-            * self.meanrate ** 2
+            normalize_frac(data.pds, data.dt, data.N, data.mean)
+            / normalize_abs(data.pds, data.dt, data.N)
+            * data.meanrate ** 2
         )
         assert np.isclose(ratio.mean(), 1, rtol=0.01)
 
-    def test_total_variance(self):
+    def test_total_variance(self, _norms_fixture):
         """Test that the total variance of the unnormalized pds is the same as
         the variance from the light curve
         Attention: VdK defines the variance as sum (x - x0)**2.
         The usual definition is divided by 'N'
         """
-        vdk_total_variance = np.sum((self.lc - self.mean) ** 2)
-        ratio = np.mean(self.pds) / vdk_total_variance
+        data = _norms_fixture
+        vdk_total_variance = np.sum((data.lc - data.mean) ** 2)
+        ratio = np.mean(data.pds) / vdk_total_variance
         assert np.isclose(ratio.mean(), 1, rtol=0.01)
 
     @pytest.mark.parametrize("norm", ["abs", "frac", "leahy"])
-    def test_poisson_level(self, norm):
-        pdsnorm = normalize_periodograms(self.pds, self.dt, self.N,
-                                         self.mean, n_ph=self.nph, norm=norm)
+    def test_poisson_level(self, norm, norm_mean_cached, _norms_fixture):
+        data = _norms_fixture
+        pdsnorm_mean = norm_mean_cached(norm)
 
         assert np.isclose(
-            pdsnorm.mean(), poisson_level(meanrate=self.meanrate, norm=norm), rtol=0.01
+            pdsnorm_mean, poisson_level(meanrate=data.meanrate, norm=norm), rtol=0.01
         )
 
     @pytest.mark.parametrize("norm", ["abs", "frac", "leahy"])
-    def test_poisson_level_real(self, norm):
-        pdsnorm = normalize_periodograms(
-            self.pds, self.dt, self.N, self.mean, n_ph=self.nph,
-            norm=norm, power_type="real"
-        )
+    def test_poisson_level_real(self, norm, norm_mean_cached, _norms_fixture):
+        data = _norms_fixture
+        pdsnorm_mean = norm_mean_cached(norm, "real")
 
         assert np.isclose(
-            pdsnorm.mean(), poisson_level(meanrate=self.meanrate, norm=norm), rtol=0.01
+            pdsnorm_mean, poisson_level(meanrate=data.meanrate, norm=norm), rtol=0.01
         )
 
     @pytest.mark.parametrize("norm", ["abs", "frac", "leahy"])
-    def test_poisson_level_absolute(self, norm):
-        pdsnorm = normalize_periodograms(
-            self.pds, self.dt, self.N, self.mean, n_ph=self.nph,
-            norm=norm, power_type="abs"
-        )
+    def test_poisson_level_absolute(self, norm, norm_mean_cached, _norms_fixture):
+        data = _norms_fixture
+        pdsnorm_mean = norm_mean_cached(norm, "abs")
 
         assert np.isclose(
-            pdsnorm.mean(), poisson_level(meanrate=self.meanrate, norm=norm), rtol=0.01
+            pdsnorm_mean, poisson_level(meanrate=data.meanrate, norm=norm), rtol=0.01
         )
 
-    def test_normalize_with_variance(self):
+    def test_normalize_with_variance(self, _norms_fixture):
+        data = _norms_fixture
         pdsnorm = normalize_periodograms(
-            self.pds, self.dt, self.N, self.mean, variance=self.var, norm="leahy"
+            data.pds, data.dt, data.N, data.mean, variance=data.var, norm="leahy"
         )
         assert np.isclose(pdsnorm.mean(), 2, rtol=0.01)
 
-    def test_normalize_with_variance_fails_if_variance_zero(self):
+    def test_normalize_with_variance_fails_if_variance_zero(self, _norms_fixture):
+        data = _norms_fixture
         # If the variance is zero, it will fail:
         with pytest.raises(ValueError) as excinfo:
-            pdsnorm = normalize_leahy_from_variance(self.pds, 0., self.N)
+            pdsnorm = normalize_leahy_from_variance(data.pds, 0., data.N)
         assert "The variance used to normalize the" in str(excinfo.value)
 
-    def test_normalize_none(self):
-        pdsnorm = normalize_periodograms(self.pds, self.dt, self.N,
-                                         self.mean, n_ph=self.nph, norm="none")
-        assert np.isclose(pdsnorm.mean(), self.pds.mean(), rtol=0.01)
+    def test_normalize_none(self, norm_mean_cached, _norms_fixture):
+        data = _norms_fixture
+        pdsnorm_mean = norm_mean_cached("none")
+        assert np.isclose(pdsnorm_mean, data.pds.mean(), rtol=0.01)
 
-    def test_normalize_badnorm(self):
+    def test_normalize_badnorm(self, _norms_fixture):
+        data = _norms_fixture
         with pytest.raises(ValueError):
             pdsnorm = normalize_periodograms(
-                self.pds, self.var, self.N, self.mean, n_ph=self.nph, norm="asdfjlasdjf"
+                data.pds, data.var, data.N, data.mean, n_ph=data.nph, norm="asdfjlasdjf"
             )
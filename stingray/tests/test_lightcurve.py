@@ -1087,6 +1087,32 @@ class TestLightcurve(object):
         assert np.allclose(lc0.gti, [[0.5, 4.5]])
         assert np.allclose(lc1.gti, [[5.5, 7.5]])
 
+    def test_split_lc_by_gtis_returns_views(self):
+        times = [1, 2, 3, 4, 5, 6, 7, 8]
+        counts = [1, 1, 1, 1, 2, 3, 3, 2]
+        gti = [[0.5, 4.5], [5.5, 7.5]]
+
+        lc = Lightcurve(times, counts, gti=gti)
+        for lc_seg in lc.split_by_gti():
+            assert np.shares_memory(lc_seg.time, lc.time)
+            assert np.shares_memory(lc_seg.counts, lc.counts)
+            assert np.shares_memory(lc_seg.counts_err, lc.counts_err)
+
+        # Writing into a segment modifies the original light curve...
+        lc_seg = lc.split_by_gti()[1]
+        assert lc_seg.time[0] == lc.time[5]
+        lc_seg.counts[0] = 100
+        lc_seg.counts_err[0] = 50
+        assert lc.counts[5] == 100
+        assert lc.counts_err[5] == 50
+
+        # ...unless the segment is copied first
+        lc_copy = copy.deepcopy(lc_seg)
+        lc_copy.counts[0] = 0
+        lc_copy.counts_err[0] = 0
+        assert lc.counts[5] == 100
+        assert lc.counts_err[5] == 50
+
     def test_split_lc_by_gtis_minpoints(self):
         times = [1, 2, 3, 4, 5, 6, 7, 8]
         counts = [1, 1, 1, 1, 2, 3, 3, 2]